@@ -12,16 +12,23 @@ Endpointy:
 - /zblizenia - detekcja miejsc zbliżeń satelitów
 """
 
+import hashlib
 import logging
 import re
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict
+from typing import Optional, Tuple
 
+import numpy as np
 from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, Path
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from sqlalchemy import exists, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 
 from satelity_modele import (
     ModelOrbityBD,
@@ -50,9 +57,21 @@ from satelity_serwisy import (
     WalidatorISO8601,
     BladWalidacjiCzasu,
 )
+from satelity_serwisy_jit import skanuj_zblizenia, stale_orbitalne
 
 log = logging.getLogger(__name__)
 
+# Format precyzji analizy zdarzeń i mnożniki jednostek [sekundy]
+_WZORZEC_PRECYZJI = re.compile(r'^(\d+)(ms|s|m|h|d)$')
+_SEKUNDY_JEDNOSTKI = {'ms': 1e-3, 's': 1.0, 'm': 60.0, 'h': 3600.0, 'd': 86400.0}
+
+# Pamięć wyników analizy zdarzeń: bloki siatki czasowej wyrównane do epoki [liczba kroków]
+ROZMIAR_BLOKU_PAMIECI = 256
+MAX_BLOKOW_PAMIECI = 4096
+
+# Walidator bezstanowy - jedna instancja współdzielona przez wszystkie zapytania
+_WALIDATOR = WalidatorISO8601()
+
 
 # ===========================================================================================
 # SERWISY 
@@ -63,7 +82,7 @@ class SerwisObliczenOrbitalalnych:
     
     def __init__(self, propagator):
         self.propagator = propagator
-        self.walidator = WalidatorISO8601()
+        self.walidator = _WALIDATOR
         log.info(f"Zainicjalizowano serwis obliczeń z propagatorem: {propagator.__class__.__name__}")
     
     def oblicz_pozycje_w_czasie(
@@ -116,31 +135,22 @@ class SerwisAnalizyZdarzen:
     def __init__(self, serwis_obliczen: SerwisObliczenOrbitalalnych):
         self.serwis_obliczen = serwis_obliczen
         self.prog_wykrywania = TOLERANCJA_ZBLIZENIA
+        self.pamiec_blokow: OrderedDict = OrderedDict()
         log.info(f"Zainicjalizowano serwis zdarzeń z progiem: {self.prog_wykrywania} km")
     
     def parsuj_precyzje(self, tekst_precyzji: str) -> timedelta:
         """Parsuje string precyzji na timedelta"""
-        pattern = r'^(\d+)(ms|s|m|h|d)$'
-        match = re.match(pattern, tekst_precyzji)
+        match = _WZORZEC_PRECYZJI.match(tekst_precyzji)
         
         if not match:
             raise ValueError(f"Nieprawidłowy format precyzji: {tekst_precyzji}")
         
         wartosc = int(match.group(1))
-        jednostka = match.group(2)
         
         if wartosc < 1:
             raise ValueError("Wartość precyzji musi być >= 1")
         
-        mapowanie = {
-            'ms': lambda v: timedelta(milliseconds=v),
-            's': lambda v: timedelta(seconds=v),
-            'm': lambda v: timedelta(minutes=v),
-            'h': lambda v: timedelta(hours=v),
-            'd': lambda v: timedelta(days=v)
-        }
-        
-        return mapowanie[jednostka](wartosc)
+        return timedelta(seconds=wartosc * _SEKUNDY_JEDNOSTKI[match.group(2)])
     
     def zaokraglij_do_siatki(self, dt: datetime, delta: timedelta) -> datetime:
         """Zaokrągla datetime do najbliższej siatki czasowej"""
@@ -151,15 +161,18 @@ class SerwisAnalizyZdarzen:
         
         return datetime.fromtimestamp(zaokraglony, tz=timezone.utc)
     
-    def wykryj_zdarzenia_w_przedziale(
+    def wykryj_zdarzenia_tablicowo(
         self,
         obiekty,
         czas_start: datetime,
         czas_koniec: datetime,
         delta_czasu: timedelta
-    ):
+    ) -> Tuple[np.ndarray, ...]:
         """
-        Wykrywa zdarzenia w przedziale czasowym
+        Wykrywa zdarzenia w przedziale czasowym - wynik w układzie tablic (SoA)
+        
+        Skompilowany kernel (z pamięcią bloków) używany jest tylko dla PropagatorKeplerowski;
+        dla innych propagatorów pozycje liczone są przez serwis obliczeń, krok po kroku.
         
         Args:
             obiekty: Lista obiektów do analizy
@@ -168,65 +181,226 @@ class SerwisAnalizyZdarzen:
             delta_czasu: Krok czasowy analizy
             
         Returns:
-            Lista wykrytych zdarzeń
+            Krotka tablic (id_a, id_b, czas [sekundy epoki], szerokość, długość, wysokość, dystans)
+            uporządkowana według (czas, id_a, id_b); w każdej parze id_a < id_b
         """
-        zdarzenia = []
-        
         # Zaokrąglij granice do siatki
         czas_start = self.zaokraglij_do_siatki(czas_start, delta_czasu)
         czas_koniec = self.zaokraglij_do_siatki(czas_koniec, delta_czasu)
         
         log.info(f"Rozpoczynam analizę zdarzeń od {czas_start} do {czas_koniec}")
         
-        # Iteruj po siatce czasowej
-        czas_obecny = czas_start
-        licznik_krokow = 0
+        # Statyczne parametry aktywnych obiektów jako ciągłe kolumny (SoA), posortowane po ID
+        aktywne = sorted(
+            (o for o in obiekty if o.stan_operacyjny == TypObiektu.AKTYWNY.value),
+            key=lambda o: o.id_rekordu
+        )
+        n = len(aktywne)
+        
+        # Zbliżenie wymaga co najmniej dwóch aktywnych obiektów - nie przechodź siatki czasu
+        if n < 2:
+            log.info(f"Zakończono analizę. Aktywnych obiektów: {n}, brak par do sprawdzenia")
+            puste_id = np.empty(0, dtype=np.int64)
+            puste = np.empty(0, dtype=np.float64)
+            return puste_id, puste_id, puste, puste, puste, puste, puste
+        
+        # Siatka czasowa jako globalne numery kroków (czas = numer * krok) - datetime tylko dla zdarzeń
+        krok = delta_czasu.total_seconds()
+        k_start = round(czas_start.timestamp() / krok)
+        k_koniec = round(czas_koniec.timestamp() / krok) + 1
+        
+        # Kernel implementuje wyłącznie model Keplerowski - inne propagatory liczone obiekt po obiekcie
+        if not isinstance(self.serwis_obliczen.propagator, PropagatorKeplerowski):
+            return self._wykryj_zdarzenia_propagatorem(aktywne, k_start, k_koniec, krok)
+        
+        orbity = [o.orbita_ref for o in aktywne]
+        
+        ids_arr = np.fromiter((o.id_rekordu for o in aktywne), dtype=np.int64, count=n)
+        # Naiwne daty z bazy traktowane jako UTC, daty ze strefą zachowują swój offset
+        t_wprow_arr = np.fromiter(
+            (
+                (d.replace(tzinfo=timezone.utc) if d.tzinfo is None else d).timestamp()
+                for d in (o.data_wprowadzenia for o in aktywne)
+            ),
+            dtype=np.float64, count=n
+        )
+        omega_arr, sin_incl_arr, cos_incl_arr, raan_arr, lon0_arr, wys_arr = stale_orbitalne(
+            SREDNICA_BAZOWA_ZIEMI + np.fromiter((orb.wysokosc_km for orb in orbity), dtype=np.float64, count=n),
+            np.fromiter((orb.kat_inklinacji for orb in orbity), dtype=np.float64, count=n),
+            np.fromiter((orb.wezel_wst for orb in orbity), dtype=np.float64, count=n),
+            np.fromiter((o.pozycja_startowa_lon for o in aktywne), dtype=np.float64, count=n)
+        )
         
-        while czas_obecny <= czas_koniec:
-            # Oblicz pozycje wszystkich aktywnych obiektów
-            pozycje_map: Dict[int, WspolrzedneGeodezyjne] = {}
-            
-            for obiekt in obiekty:
-                if obiekt.stan_operacyjny != TypObiektu.AKTYWNY.value:
-                    continue
-                
-                pozycja = self.serwis_obliczen.oblicz_pozycje_w_czasie(
-                    obiekt,
-                    czas_obecny
-                )
-                
+        # Propagacja i analiza par w kernelu; pełne bloki siatki brane z pamięci
+        parametry = (omega_arr, sin_incl_arr, cos_incl_arr, raan_arr, lon0_arr, wys_arr, t_wprow_arr)
+        idx_a, idx_b, kroki, dystanse, szer, dlug = self._skanuj_z_pamiecia(
+            parametry, k_start, k_koniec, krok
+        )
+        
+        log.info(f"Zakończono analizę. Przeanalizowano {k_koniec - k_start} kroków, wykryto {len(kroki)} zdarzeń")
+        
+        return (
+            ids_arr[idx_a],
+            ids_arr[idx_b],
+            kroki * krok,
+            szer,
+            dlug,
+            wys_arr[idx_a],
+            dystanse
+        )
+    
+    def _wykryj_zdarzenia_propagatorem(
+        self,
+        aktywne: list,
+        k_od: int,
+        k_do: int,
+        krok: float
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        Wykrywa zdarzenia dla dowolnego propagatora - pozycje przez serwis obliczeń
+        
+        Ścieżka bez kernela i bez pamięci bloków; wynik w tym samym układzie tablic
+        i porządku co wykryj_zdarzenia_tablicowo (aktywne posortowane po ID).
+        """
+        wynik = ([], [], [], [], [], [], [])
+        
+        for k in range(k_od, k_do):
+            czas = k * krok
+            moment = datetime.fromtimestamp(czas, tz=timezone.utc)
+            pozycje = []
+            for obiekt in aktywne:
+                pozycja = self.serwis_obliczen.oblicz_pozycje_w_czasie(obiekt, moment)
                 if pozycja is not None:
-                    pozycje_map[obiekt.id_rekordu] = pozycja
-            
-            # Analiza par obiektów
-            ids_aktywne = sorted(pozycje_map.keys())
+                    pozycje.append((obiekt.id_rekordu, pozycja))
             
-            for i, id_a in enumerate(ids_aktywne):
-                for id_b in ids_aktywne[i+1:]:
-                    poz_a = pozycje_map[id_a]
-                    poz_b = pozycje_map[id_b]
-                    
+            for i, (id_a, poz_a) in enumerate(pozycje):
+                for id_b, poz_b in pozycje[i + 1:]:
                     dystans = poz_a.dystans_do(poz_b)
-                    
                     if dystans < self.prog_wykrywania:
-                        zdarzenie = ZdarzeniePrzestrz(
-                            obiekt_id_a=min(id_a, id_b),
-                            obiekt_id_b=max(id_a, id_b),
-                            moment_czasu=czas_obecny,
-                            lokalizacja=poz_a,
-                            dystans_min=dystans
-                        )
-                        zdarzenia.append(zdarzenie)
-                        
-                        log.warning(
-                            f"Wykryto zbliżenie: {id_a} <-> {id_b} "
-                            f"dystans={dystans:.6f}km w {czas_obecny}"
-                        )
+                        for kolumna, wartosc in zip(wynik, (
+                            id_a, id_b, czas, poz_a.szer_geogr, poz_a.dlug_geogr, poz_a.wysokosc_npm, dystans
+                        )):
+                            kolumna.append(wartosc)
+        
+        log.info(f"Zakończono analizę. Przeanalizowano {k_do - k_od} kroków, wykryto {len(wynik[2])} zdarzeń")
+        
+        return (
+            np.array(wynik[0], dtype=np.int64),
+            np.array(wynik[1], dtype=np.int64),
+            *(np.array(kolumna, dtype=np.float64) for kolumna in wynik[2:])
+        )
+    
+    def _skanuj_kroki(self, parametry: tuple, k_od: int, k_do: int, krok: float) -> Tuple[np.ndarray, ...]:
+        """Uruchamia kernel dla kroków [k_od, k_do); idx_t zamieniane na globalne numery kroków"""
+        czasy = np.arange(k_od, k_do, dtype=np.float64) * krok
+        idx_a, idx_b, idx_t, dystanse, szer, dlug = skanuj_zblizenia(
+            *parametry, czasy, self.prog_wykrywania
+        )
+        return idx_a, idx_b, idx_t + k_od, dystanse, szer, dlug
+    
+    def _skanuj_z_pamiecia(self, parametry: tuple, k_od: int, k_do: int, krok: float) -> Tuple[np.ndarray, ...]:
+        """
+        Skanuje kroki [k_od, k_do) z pamięcią LRU wyników dla pełnych bloków siatki
+        
+        Klucz bloku to skrót zawartości tablic parametrów, krok, próg i numer bloku - każda
+        zmiana orbit lub obiektów daje nowy klucz, więc pamięć nie wymaga unieważniania.
+        Niepełne bloki na krańcach przedziału liczone są bezpośrednio.
+        
+        Returns:
+            Krotka tablic (idx_a, idx_b, numer kroku, dystans, szerokość, długość)
+            uporządkowana według (numer kroku, idx_a, idx_b)
+        """
+        b_od = -(-k_od // ROZMIAR_BLOKU_PAMIECI)
+        b_do = k_do // ROZMIAR_BLOKU_PAMIECI
+        
+        # Przedział bez pełnego bloku albo większy od pamięci - jeden przebieg bez pamięci
+        if b_od >= b_do or b_do - b_od > MAX_BLOKOW_PAMIECI:
+            return self._skanuj_kroki(parametry, k_od, k_do, krok)
+        
+        skrot = hashlib.blake2b(digest_size=16)
+        for tablica in parametry:
+            skrot.update(tablica.tobytes())
+        klucz = (skrot.digest(), krok, self.prog_wykrywania)
+        
+        # Policz brakujące bloki ciągłymi seriami - jedno wywołanie kernela na serię
+        b = b_od
+        while b < b_do:
+            if (klucz, b) in self.pamiec_blokow:
+                b += 1
+                continue
+            
+            b_koniec = b + 1
+            while b_koniec < b_do and (klucz, b_koniec) not in self.pamiec_blokow:
+                b_koniec += 1
+            
+            wynik = self._skanuj_kroki(
+                parametry, b * ROZMIAR_BLOKU_PAMIECI, b_koniec * ROZMIAR_BLOKU_PAMIECI, krok
+            )
+            granice = np.searchsorted(
+                wynik[2], np.arange(b, b_koniec + 1) * ROZMIAR_BLOKU_PAMIECI
+            )
+            for nr in range(b, b_koniec):
+                i, j = granice[nr - b], granice[nr - b + 1]
+                self.pamiec_blokow[(klucz, nr)] = tuple(t[i:j] for t in wynik)
+            
+            b = b_koniec
+        
+        # Złóż wynik w porządku czasu: początek, bloki z pamięci, koniec
+        czesci = [self._skanuj_kroki(parametry, k_od, b_od * ROZMIAR_BLOKU_PAMIECI, krok)]
+        for nr in range(b_od, b_do):
+            self.pamiec_blokow.move_to_end((klucz, nr))
+            czesci.append(self.pamiec_blokow[(klucz, nr)])
+        czesci.append(self._skanuj_kroki(parametry, b_do * ROZMIAR_BLOKU_PAMIECI, k_do, krok))
+        
+        while len(self.pamiec_blokow) > MAX_BLOKOW_PAMIECI:
+            self.pamiec_blokow.popitem(last=False)
+        
+        return tuple(np.concatenate(kolumna) for kolumna in zip(*czesci))
+    
+    def wykryj_zdarzenia_w_przedziale(
+        self,
+        obiekty,
+        czas_start: datetime,
+        czas_koniec: datetime,
+        delta_czasu: timedelta
+    ):
+        """
+        Wykrywa zdarzenia w przedziale czasowym
+        
+        Args:
+            obiekty: Lista obiektów do analizy
+            czas_start: Początek przedziału
+            czas_koniec: Koniec przedziału
+            delta_czasu: Krok czasowy analizy
             
-            czas_obecny += delta_czasu
-            licznik_krokow += 1
+        Returns:
+            Lista wykrytych zdarzeń
+        """
+        ids_a, ids_b, czasy, szer, dlug, wys, dystanse = self.wykryj_zdarzenia_tablicowo(
+            obiekty, czas_start, czas_koniec, delta_czasu
+        )
+        zdarzenia = []
         
-        log.info(f"Zakończono analizę. Przeanalizowano {licznik_krokow} kroków, wykryto {len(zdarzenia)} zdarzeń")
+        for k in range(len(czasy)):
+            id_a, id_b = int(ids_a[k]), int(ids_b[k])
+            dystans = float(dystanse[k])
+            moment = datetime.fromtimestamp(czasy[k], tz=timezone.utc)
+            
+            zdarzenie = ZdarzeniePrzestrz(
+                obiekt_id_a=id_a,
+                obiekt_id_b=id_b,
+                moment_czasu=moment,
+                lokalizacja=WspolrzedneGeodezyjne(
+                    float(szer[k]), float(dlug[k]), float(wys[k])
+                ),
+                dystans_min=dystans
+            )
+            zdarzenia.append(zdarzenie)
+            
+            log.warning(
+                f"Wykryto zbliżenie: {id_a} <-> {id_b} "
+                f"dystans={dystans:.6f}km w {moment}"
+            )
         
         return zdarzenia
 
@@ -237,13 +411,45 @@ class SerwisAnalizyZdarzen:
 
 def waliduj_identyfikator_dodatni(id_str: str) -> int:
     """Waliduje i konwertuje ID na dodatnią liczbę całkowitą"""
-    try:
+    # Tylko cyfry ASCII - bez znaku, spacji i separatorów; wyklucza ścieżkę wyjątku int()
+    if id_str.isascii() and id_str.isdigit():
         id_int = int(id_str)
-        if id_int <= 0:
-            raise HTTPException(status_code=400, detail="Nieprawidłowy format identyfikatora")
-        return id_int
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Nieprawidłowy format identyfikatora")
+        if id_int > 0:
+            return id_int
+    
+    raise HTTPException(status_code=400, detail="Nieprawidłowy format identyfikatora")
+
+
+def zatwierdz_unikalne(sesja: Session, komunikat_konfliktu: str):
+    """Zatwierdza transakcję; naruszenie ograniczenia UNIQUE zamienia na HTTP 409"""
+    try:
+        sesja.commit()
+    except IntegrityError:
+        sesja.rollback()
+        raise HTTPException(status_code=409, detail=komunikat_konfliktu)
+
+
+def orbita_istnieje(sesja: Session, id_orbity: int) -> bool:
+    """Sprawdza istnienie orbity jednym zapytaniem EXISTS"""
+    return sesja.query(exists().where(ModelOrbityBD.id_rekordu == id_orbity)).scalar()
+
+
+def pobierz_strone(zapytanie, pominiete: int, limit: int) -> Tuple[list, int]:
+    """Pobiera stronę wyników razem z łączną liczbą rekordów w jednym zapytaniu"""
+    wiersze = zapytanie.add_columns(
+        func.count().over().label("razem")
+    ).offset(pominiete).limit(limit).all()
+    
+    if wiersze:
+        return [w[0] for w in wiersze], wiersze[0][1]
+    
+    # Strona poza zakresem - bez wierszy nie ma licznika okna, policz osobno
+    return [], (zapytanie.count() if pominiete else 0)
+
+
+def odpowiedz_json(schemat: BaseModel) -> Response:
+    """Serializuje zaufany schemat bezpośrednio do JSON, z pominięciem walidacji odpowiedzi FastAPI"""
+    return Response(content=schemat.model_dump_json(), media_type="application/json")
 
 
 def waliduj_parametry_stronicowania(pominiete: int, limit: int):
@@ -281,6 +487,11 @@ serwis_zdarzen_globalny = SerwisAnalizyZdarzen(serwis_obliczen_globalny)
 # OBSŁUGA WYJĄTKÓW
 # ===========================================================================================
 
+# Komunikaty błędów walidacji zależne od ścieżki - wyznaczone przy imporcie
+_BLEDY_SCIEZEK = {"/zblizenia": "Nieprawidłowy format lub zakres dat"}
+_SUFIKS_POZYCJI = "/position"
+
+
 @system_api.exception_handler(RequestValidationError)
 async def obsluz_blad_walidacji(zapytanie: Request, wyjatek: RequestValidationError):
     """Obsługa błędów walidacji"""
@@ -292,14 +503,17 @@ async def obsluz_blad_walidacji(zapytanie: Request, wyjatek: RequestValidationEr
             if len(loc) >= 2 and loc[0] == 'path' and loc[1] == 'id':
                 return JSONResponse(status_code=400, content={"detail": "Nieprawidłowy format identyfikatora"})
         
-        if "/position" in str(zapytanie.url.path):
+        sciezka = zapytanie.url.path
+        
+        if sciezka.endswith(_SUFIKS_POZYCJI):
             for err in errors:
                 loc = err.get('loc', [])
                 if len(loc) >= 2 and loc[0] == 'query' and loc[1] == 'timestamp':
                     return JSONResponse(status_code=400, content={"detail": "Nieprawidłowy identyfikator lub znacznik czasu"})
         
-        if zapytanie.url.path == "/zblizenia":
-            return JSONResponse(status_code=400, content={"detail": "Nieprawidłowy format lub zakres dat"})
+        komunikat = _BLEDY_SCIEZEK.get(sciezka)
+        if komunikat is not None:
+            return JSONResponse(status_code=400, content={"detail": komunikat})
         
         return JSONResponse(status_code=400, content={"detail": "Nieprawidłowe dane wejściowe"})
     
@@ -311,20 +525,40 @@ async def obsluz_blad_walidacji(zapytanie: Request, wyjatek: RequestValidationEr
 # ENDPOINTY - Główne
 # ===========================================================================================
 
+# Odpowiedź endpointu głównego jest stała - serializowana raz przy starcie
+_ODPOWIEDZ_GLOWNA = JSONResponse({
+    "message": "System Śledzenia Orbit - API v2.0",
+    "docs": "/docs",
+    "status": "operational"
+})
+
+# Odpowiedź /status odświeżana najwyżej raz na sekundę: (chwila monotoniczna, odpowiedź)
+_ODSWIEZANIE_STANU_S = 1.0
+_stan_bufor: Tuple[float, Optional[JSONResponse]] = (float("-inf"), None)
+
+
 @system_api.get("/")
 async def endpoint_glowny():
     """Endpoint główny z informacjami o systemie"""
-    return {
-        "message": "System Śledzenia Orbit - API v2.0",
-        "docs": "/docs",
-        "status": "operational"
-    }
+    return _ODPOWIEDZ_GLOWNA
 
 
 @system_api.get("/status")
 async def sprawdzenie_stanu():
     """Sprawdzenie stanu systemu"""
-    return {"status": "działa", "timestamp": datetime.now(timezone.utc).isoformat()}
+    global _stan_bufor
+    
+    chwila, odpowiedz = _stan_bufor
+    teraz = time.monotonic()
+    
+    if odpowiedz is None or teraz - chwila >= _ODSWIEZANIE_STANU_S:
+        odpowiedz = JSONResponse({
+            "status": "działa",
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
+        _stan_bufor = (teraz, odpowiedz)
+    
+    return odpowiedz
 
 
 # ===========================================================================================
@@ -337,15 +571,7 @@ async def utworz_orbite(
     sesja: Session = Depends(uzyskaj_sesje_bd)
 ):
     """Tworzy nową orbitę w katalogu"""
-    # Sprawdź unikalność
-    istniejaca = sesja.query(ModelOrbityBD).filter(
-        ModelOrbityBD.identyfikator_orbity == dane_wej.identyfikator_orbity
-    ).first()
-    
-    if istniejaca:
-        raise HTTPException(status_code=409, detail="Nazwa orbity już istnieje")
-    
-    # Utwórz rekord
+    # Utwórz rekord (unikalność nazwy pilnuje ograniczenie UNIQUE)
     nowa_orbita = ModelOrbityBD(
         identyfikator_orbity=dane_wej.identyfikator_orbity,
         wysokosc_km=dane_wej.wysokosc_km,
@@ -354,7 +580,7 @@ async def utworz_orbite(
     )
     
     sesja.add(nowa_orbita)
-    sesja.commit()
+    zatwierdz_unikalne(sesja, "Nazwa orbity już istnieje")
     sesja.refresh(nowa_orbita)
     
     log.info(f"Utworzono orbitę: {dane_wej.identyfikator_orbity}")
@@ -370,9 +596,7 @@ async def pobierz_orbite(
     """Pobiera orbitę po ID"""
     id_val = waliduj_identyfikator_dodatni(id_zasobu)
     
-    orbita = sesja.query(ModelOrbityBD).filter(
-        ModelOrbityBD.id_rekordu == id_val
-    ).first()
+    orbita = sesja.get(ModelOrbityBD, id_val)
     
     if not orbita:
         raise HTTPException(status_code=404, detail="Orbita nie znaleziona")
@@ -397,15 +621,14 @@ async def listuj_orbity(
             ModelOrbityBD.identyfikator_orbity.ilike(f"%{nazwa}%")
         )
     
-    total = zapytanie.count()
-    orbity = zapytanie.offset(skip).limit(limit).all()
+    orbity, total = pobierz_strone(zapytanie, skip, limit)
     
-    return SchematListyOrbit(
+    return odpowiedz_json(SchematListyOrbit.model_construct(
         orbity=[SchematOrbitWyjscie.z_modelu(o) for o in orbity],
         razem=total,
         pomin=skip,
         limit=limit
-    )
+    ))
 
 
 @system_api.put("/orbity/{id}", response_model=SchematOrbitWyjscie)
@@ -417,29 +640,18 @@ async def aktualizuj_orbite(
     """Aktualizuje parametry orbity"""
     id_val = waliduj_identyfikator_dodatni(id_zasobu)
     
-    orbita = sesja.query(ModelOrbityBD).filter(
-        ModelOrbityBD.id_rekordu == id_val
-    ).first()
+    orbita = sesja.get(ModelOrbityBD, id_val)
     
     if not orbita:
         raise HTTPException(status_code=404, detail="Orbita nie znaleziona")
     
-    # Sprawdź konflikt nazwy
-    konflikt = sesja.query(ModelOrbityBD).filter(
-        ModelOrbityBD.identyfikator_orbity == dane_wej.identyfikator_orbity,
-        ModelOrbityBD.id_rekordu != id_val
-    ).first()
-    
-    if konflikt:
-        raise HTTPException(status_code=409, detail="Nazwa orbity już istnieje")
-    
-    # Aktualizuj
+    # Aktualizuj (konflikt nazwy zgłasza ograniczenie UNIQUE)
     orbita.identyfikator_orbity = dane_wej.identyfikator_orbity
     orbita.wysokosc_km = dane_wej.wysokosc_km
     orbita.kat_inklinacji = dane_wej.kat_inklinacji
     orbita.wezel_wst = dane_wej.wezel_wst
     
-    sesja.commit()
+    zatwierdz_unikalne(sesja, "Nazwa orbity już istnieje")
     sesja.refresh(orbita)
     
     log.info(f"Zaktualizowano orbitę ID={id_val}")
@@ -455,19 +667,17 @@ async def usun_orbite(
     """Usuwa orbitę z katalogu"""
     id_val = waliduj_identyfikator_dodatni(id_zasobu)
     
-    orbita = sesja.query(ModelOrbityBD).filter(
-        ModelOrbityBD.id_rekordu == id_val
-    ).first()
+    orbita = sesja.get(ModelOrbityBD, id_val)
     
     if not orbita:
         raise HTTPException(status_code=404, detail="Orbita nie znaleziona")
     
     # Sprawdź powiązania
-    liczba_powiazanych = sesja.query(ModelObiektuBD).filter(
-        ModelObiektuBD.id_orbity_powiazanej == id_val
-    ).count()
+    uzywana = sesja.query(
+        exists().where(ModelObiektuBD.id_orbity_powiazanej == id_val)
+    ).scalar()
     
-    if liczba_powiazanych > 0:
+    if uzywana:
         raise HTTPException(status_code=409, detail="Orbita jest używana przez obiekty")
     
     sesja.delete(orbita)
@@ -489,20 +699,8 @@ async def utworz_obiekt(
 ):
     """Dodaje nowy obiekt orbitalny do katalogu"""
     try:
-        # Sprawdź unikalność nazwy
-        istniejacy = sesja.query(ModelObiektuBD).filter(
-            ModelObiektuBD.nazwa_obiektu == dane_wej.nazwa_obiektu
-        ).first()
-        
-        if istniejacy:
-            raise HTTPException(status_code=409, detail="Nazwa obiektu już istnieje")
-        
-        # Sprawdź istnienie orbity
-        orbita = sesja.query(ModelOrbityBD).filter(
-            ModelOrbityBD.id_rekordu == dane_wej.id_orbity_powiazanej
-        ).first()
-        
-        if not orbita:
+        # Sprawdź istnienie orbity (unikalność nazwy pilnuje ograniczenie UNIQUE)
+        if not orbita_istnieje(sesja, dane_wej.id_orbity_powiazanej):
             raise HTTPException(status_code=400, detail="Nieprawidłowy identyfikator orbity")
         
         # Utwórz obiekt
@@ -516,7 +714,7 @@ async def utworz_obiekt(
         )
         
         sesja.add(nowy_obiekt)
-        sesja.commit()
+        zatwierdz_unikalne(sesja, "Nazwa obiektu już istnieje")
         sesja.refresh(nowy_obiekt)
         
         log.info(f"Utworzono obiekt: {dane_wej.nazwa_obiektu}")
@@ -537,9 +735,7 @@ async def pobierz_obiekt(
     """Pobiera obiekt po ID"""
     id_val = waliduj_identyfikator_dodatni(id_zasobu)
     
-    obiekt = sesja.query(ModelObiektuBD).filter(
-        ModelObiektuBD.id_rekordu == id_val
-    ).first()
+    obiekt = sesja.get(ModelObiektuBD, id_val)
     
     if not obiekt:
         raise HTTPException(status_code=404, detail="Satelita nie znaleziony")
@@ -564,15 +760,14 @@ async def listuj_obiekty(
             ModelObiektuBD.operator_systemu.ilike(f"%{operator}%")
         )
     
-    total = zapytanie.count()
-    obiekty = zapytanie.offset(skip).limit(limit).all()
+    obiekty, total = pobierz_strone(zapytanie, skip, limit)
     
-    return SchematListyObiektow(
+    return odpowiedz_json(SchematListyObiektow.model_construct(
         satelity=[SchematObiektuWyjscie.z_modelu(o) for o in obiekty],
         razem=total,
         pomin=skip,
         limit=limit
-    )
+    ))
 
 
 @system_api.put("/satelity/{id}", response_model=SchematObiektuWyjscie)
@@ -584,28 +779,13 @@ async def aktualizuj_obiekt(
     """Aktualizuje parametry obiektu orbitalnego"""
     id_val = waliduj_identyfikator_dodatni(id_zasobu)
     
-    obiekt = sesja.query(ModelObiektuBD).filter(
-        ModelObiektuBD.id_rekordu == id_val
-    ).first()
+    obiekt = sesja.get(ModelObiektuBD, id_val)
     
     if not obiekt:
         raise HTTPException(status_code=404, detail="Satelita nie znaleziony")
     
-    # Sprawdź konflikt nazwy
-    konflikt = sesja.query(ModelObiektuBD).filter(
-        ModelObiektuBD.nazwa_obiektu == dane_wej.nazwa_obiektu,
-        ModelObiektuBD.id_rekordu != id_val
-    ).first()
-    
-    if konflikt:
-        raise HTTPException(status_code=409, detail="Nazwa obiektu już istnieje")
-    
-    # Sprawdź orbitę
-    orbita = sesja.query(ModelOrbityBD).filter(
-        ModelOrbityBD.id_rekordu == dane_wej.id_orbity_powiazanej
-    ).first()
-    
-    if not orbita:
+    # Sprawdź orbitę (konflikt nazwy zgłasza ograniczenie UNIQUE)
+    if not orbita_istnieje(sesja, dane_wej.id_orbity_powiazanej):
         raise HTTPException(status_code=400, detail="Nieprawidłowy format identyfikatora lub dane")
     
     # Aktualizuj
@@ -616,7 +796,7 @@ async def aktualizuj_obiekt(
     obiekt.pozycja_startowa_lon = dane_wej.pozycja_startowa_lon
     obiekt.id_orbity_powiazanej = dane_wej.id_orbity_powiazanej
     
-    sesja.commit()
+    zatwierdz_unikalne(sesja, "Nazwa obiektu już istnieje")
     sesja.refresh(obiekt)
     
     log.info(f"Zaktualizowano obiekt ID={id_val}")
@@ -632,9 +812,7 @@ async def usun_obiekt(
     """Usuwa obiekt z katalogu"""
     id_val = waliduj_identyfikator_dodatni(id_zasobu)
     
-    obiekt = sesja.query(ModelObiektuBD).filter(
-        ModelObiektuBD.id_rekordu == id_val
-    ).first()
+    obiekt = sesja.get(ModelObiektuBD, id_val)
     
     if not obiekt:
         raise HTTPException(status_code=404, detail="Satelita nie znaleziony")
@@ -666,17 +844,14 @@ async def oblicz_pozycje_obiektu(
         raise
     
     # Pobierz obiekt
-    obiekt = sesja.query(ModelObiektuBD).filter(
-        ModelObiektuBD.id_rekordu == id_val
-    ).first()
+    obiekt = sesja.get(ModelObiektuBD, id_val)
     
     if not obiekt:
         raise HTTPException(status_code=404, detail="Satelita nie znaleziony")
     
     # Waliduj znacznik czasu
     try:
-        walidator = WalidatorISO8601()
-        znacznik = walidator.waliduj_znacznik(znacznik_czasu)
+        znacznik = _WALIDATOR.waliduj_znacznik(znacznik_czasu)
     except BladWalidacjiCzasu:
         raise HTTPException(status_code=400, detail="Nieprawidłowy format znacznika czasu")
     
@@ -714,12 +889,10 @@ async def wykryj_zblizenia(
 ):
     """Wykrywa miejsca zbliżeń (spotkań) satelitów w przedziale czasowym"""
     try:
-        walidator = WalidatorISO8601()
-        
         # Parsuj daty
         try:
-            dt_start = walidator.waliduj_znacznik(data_poczatkowa)
-            dt_koniec = walidator.waliduj_znacznik(data_koncowa)
+            dt_start = _WALIDATOR.waliduj_znacznik(data_poczatkowa)
+            dt_koniec = _WALIDATOR.waliduj_znacznik(data_koncowa)
         except BladWalidacjiCzasu:
             raise HTTPException(status_code=400, detail="Nieprawidłowy format znacznika czasu")
         
@@ -733,36 +906,47 @@ async def wykryj_zblizenia(
         except ValueError:
             raise HTTPException(status_code=400, detail="Nieprawidłowy format znacznika czasu")
         
-        # Pobierz wszystkie obiekty
-        obiekty = sesja.query(ModelObiektuBD).join(ModelOrbityBD).all()
+        # Pobierz wszystkie obiekty wraz z orbitami (jedno zapytanie)
+        obiekty = sesja.query(ModelObiektuBD).options(
+            joinedload(ModelObiektuBD.orbita_ref, innerjoin=True)
+        ).all()
         
-        # Wykryj zdarzenia
-        zdarzenia = serwis_zdarzen_globalny.wykryj_zdarzenia_w_przedziale(
+        # Wykryj zdarzenia - kernel zwraca je już uporządkowane według (czas, satelita1, satelita2)
+        ids_a, ids_b, czasy, szer, dlug, wys, _ = serwis_zdarzen_globalny.wykryj_zdarzenia_tablicowo(
             obiekty,
             dt_start,
             dt_koniec,
             delta_czasu
         )
         
-        # Sortuj
-        zdarzenia.sort(key=lambda z: (z.moment_czasu, z.obiekt_id_a, z.obiekt_id_b))
+        # Formatowanie ISO-8601 całego wektora czasów naraz (zaokrąglenie do mikrosekund jak w datetime)
+        czasy_iso = np.char.add(
+            np.datetime_as_string(
+                np.round(czasy * 1e6).astype(np.int64).astype("datetime64[us]"),
+                unit="s"
+            ),
+            "Z"
+        )
         
-        # Konwertuj na schematy
+        # Konwertuj na schematy w jednym przebiegu po tablicach - dane pochodzą z kernela
+        # i mają już właściwe typy, więc walidacja Pydantic jest pomijana (model_construct)
         kolizje_out = [
-            SchematZdarzeniaKolizji(
-                satelita1=z.obiekt_id_a,
-                satelita2=z.obiekt_id_b,
-                czas=z.moment_czasu.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                pozycja=SchematPozycjiWyjscie(
-                    szerokosc=z.lokalizacja.szer_geogr,
-                    dlugosc=z.lokalizacja.dlug_geogr,
-                    wysokosc=z.lokalizacja.wysokosc_npm
+            SchematZdarzeniaKolizji.model_construct(
+                satelita1=id_a,
+                satelita2=id_b,
+                czas=czas,
+                pozycja=SchematPozycjiWyjscie.model_construct(
+                    szerokosc=lat,
+                    dlugosc=lon,
+                    wysokosc=alt
                 )
             )
-            for z in zdarzenia
+            for id_a, id_b, czas, lat, lon, alt in zip(
+                ids_a.tolist(), ids_b.tolist(), czasy_iso.tolist(), szer.tolist(), dlug.tolist(), wys.tolist()
+            )
         ]
         
-        return SchematListyKolizji(zblizenia=kolizje_out)
+        return odpowiedz_json(SchematListyKolizji.model_construct(zblizenia=kolizje_out))
     
     except HTTPException:
         raise
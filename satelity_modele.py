@@ -13,13 +13,15 @@ Zawiera:
 
 import logging
 import math
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, Tuple, List
+from typing import Any, Dict, Tuple, List, Optional
 
-from pydantic import BaseModel, Field, validator
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey
+import dateutil.parser
+from pydantic import BaseModel, ConfigDict, Field, validator
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.pool import StaticPool
@@ -47,6 +49,33 @@ MINIMALNA_WYSOKOSC_ORBITY = 160.0  # km nad poziomem morza
 MAKSYMALNA_WYSOKOSC_ORBITY = 40000.0  # km
 
 
+# ===========================================================================================
+# FUNKCJE POMOCNICZE
+# ===========================================================================================
+
+# Kształt, dla którego datetime.fromisoformat i dateutil.parser.isoparse są zgodne
+_WZORZEC_ISO_SZYBKI = re.compile(
+    r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:Z|[+-]\d{2}:[0-5]\d)?)?"
+)
+
+
+def parsuj_czas_iso(tekst: str) -> datetime:
+    """Parsuje ISO 8601 - dateutil rozstrzyga, fromisoformat tylko dla typowego kształtu"""
+    if _WZORZEC_ISO_SZYBKI.fullmatch(tekst):
+        try:
+            return datetime.fromisoformat(tekst)
+        except ValueError:
+            pass
+    return dateutil.parser.isoparse(tekst)
+
+
+def formatuj_czas_iso(dt: datetime) -> str:
+    """Formatuje datetime jako 'YYYY-MM-DDTHH:MM:SSZ' bez pośrednictwa strftime"""
+    return "%04d-%02d-%02dT%02d:%02d:%02dZ" % (
+        dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second
+    )
+
+
 # ===========================================================================================
 # TYPY WYLICZENIOWE
 # ===========================================================================================
@@ -71,56 +100,76 @@ class KategoriaPrecyzji(str, Enum):
 # DATACLASSES - Struktury danych domenowych
 # ===========================================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WspolrzedneGeodezyjne:
-    """Współrzędne geodezyjne obiektu w przestrzeni"""
+    """Współrzędne geodezyjne obiektu w przestrzeni (niemutowalny obiekt wartości)"""
     szer_geogr: float  # szerokość geograficzna [-90, 90]
     dlug_geogr: float  # długość geograficzna [-180, 180]
     wysokosc_npm: float  # wysokość nad poziomem morza [km]
+    _ecef: Optional[Tuple[float, float, float]] = field(default=None, init=False, repr=False, compare=False)
     
     def do_kartezjanskich(self) -> Tuple[float, float, float]:
-        """Konwersja do współrzędnych kartezjańskich ECEF"""
+        """Konwersja do współrzędnych kartezjańskich ECEF (liczona raz, potem z pamięci)"""
+        ecef = self._ecef
+        if ecef is not None:
+            return ecef
+        
         promien_calkowity = SREDNICA_BAZOWA_ZIEMI + self.wysokosc_npm
         
         lat_rad = math.radians(self.szer_geogr)
         lon_rad = math.radians(self.dlug_geogr)
+        cos_lat = math.cos(lat_rad)
         
-        x_ecef = promien_calkowity * math.cos(lat_rad) * math.cos(lon_rad)
-        y_ecef = promien_calkowity * math.cos(lat_rad) * math.sin(lon_rad)
+        x_ecef = promien_calkowity * cos_lat * math.cos(lon_rad)
+        y_ecef = promien_calkowity * cos_lat * math.sin(lon_rad)
         z_ecef = promien_calkowity * math.sin(lat_rad)
         
-        return x_ecef, y_ecef, z_ecef
+        ecef = (x_ecef, y_ecef, z_ecef)
+        object.__setattr__(self, "_ecef", ecef)
+        return ecef
     
     def dystans_do(self, inne: 'WspolrzedneGeodezyjne') -> float:
         """Oblicza dystans 3D do innych współrzędnych"""
-        x1, y1, z1 = self.do_kartezjanskich()
-        x2, y2, z2 = inne.do_kartezjanskich()
-        
-        return math.sqrt((x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2)
+        return math.dist(self.do_kartezjanskich(), inne.do_kartezjanskich())
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ParametryOrbitalne:
-    """Parametry Keplerian opisujące orbitę"""
+    """Parametry Keplerian opisujące orbitę (stałe pochodne liczone raz przy utworzeniu)"""
     polOs_wielka: float  # semi-major axis [km]
     inklinacja_kat: float  # inclination [stopnie]
     wezl_wstepujacy: float  # RAAN - Right Ascension of Ascending Node [stopnie]
+    okres_orbitalny: float = field(init=False, repr=False, compare=False)  # [s]
+    predkosc_katowa: float = field(init=False, repr=False, compare=False)  # [rad/s]
+    sin_inklinacji: float = field(init=False, repr=False, compare=False)
+    cos_inklinacji: float = field(init=False, repr=False, compare=False)
+    raan_rad: float = field(init=False, repr=False, compare=False)  # [rad]
     
-    def oblicz_okres_orbitalny(self) -> float:
-        """Oblicza okres orbitalny T = 2Pi*pierw2(a3/μ)"""
-        return 2 * math.pi * math.sqrt(
-            self.polOs_wielka**3 / PARAMETR_GRAWIT_ZIEMI
+    def __post_init__(self):
+        """Wyznacza stałe pochodne orbity: T = 2Pi*pierw2(a3/μ), omega = 2Pi/T, funkcje kątów"""
+        okres = 2 * math.pi * math.sqrt(self.polOs_wielka**3 / PARAMETR_GRAWIT_ZIEMI)
+        object.__setattr__(self, "okres_orbitalny", okres)
+        object.__setattr__(
+            self, "predkosc_katowa", 2 * math.pi / okres if okres > EPSILON_NUMERYCZNY else 0.0
         )
+        
+        inklinacja_rad = math.radians(self.inklinacja_kat)
+        object.__setattr__(self, "sin_inklinacji", math.sin(inklinacja_rad))
+        object.__setattr__(self, "cos_inklinacji", math.cos(inklinacja_rad))
+        object.__setattr__(self, "raan_rad", math.radians(self.wezl_wstepujacy))
+    
+    def oblicz_okres_orbitalny(self) -> float:
+        """Zwraca okres orbitalny T = 2Pi*pierw2(a3/μ)"""
+        return self.okres_orbitalny
     
     def oblicz_predkosc_katowa(self) -> float:
-        """Oblicza prędkość kątową omega = 2Pi/T"""
-        T = self.oblicz_okres_orbitalny()
-        return 2 * math.pi / T if T > EPSILON_NUMERYCZNY else 0.0
+        """Zwraca prędkość kątową omega = 2Pi/T"""
+        return self.predkosc_katowa
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ZdarzeniePrzestrz:
-    """Zdarzenie w przestrzeni - np. zbliżenie obiektów"""
+    """Zdarzenie w przestrzeni - np. zbliżenie obiektów (niemutowalny obiekt wartości)"""
     obiekt_id_a: int
     obiekt_id_b: int
     moment_czasu: datetime
@@ -132,7 +181,7 @@ class ZdarzeniePrzestrz:
         return {
             "satelita1": self.obiekt_id_a,
             "satelita2": self.obiekt_id_b,
-            "czas": self.moment_czasu.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "czas": formatuj_czas_iso(self.moment_czasu),
             "pozycja": {
                 "szerokosc": self.lokalizacja.szer_geogr,
                 "dlugosc": self.lokalizacja.dlug_geogr,
@@ -149,9 +198,28 @@ class ZdarzeniePrzestrz:
 silnik_bd = create_engine(
     "sqlite:///:memory:",
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool
+    poolclass=StaticPool,
+    query_cache_size=1200
 )
 
+# Ustawienia SQLite dla każdego nowego połączenia (journal_mode WAL działa dla bazy plikowej)
+USTAWIENIA_SQLITE = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+
+@event.listens_for(silnik_bd, "connect")
+def ustaw_pragmy_sqlite(polaczenie_dbapi, _rekord_polaczenia):
+    """Stosuje ustawienia wydajnościowe SQLite przy otwarciu połączenia"""
+    kursor = polaczenie_dbapi.cursor()
+    for pragma in USTAWIENIA_SQLITE:
+        kursor.execute(pragma)
+    kursor.close()
+
 FabrykaSesji = sessionmaker(autocommit=False, autoflush=False, bind=silnik_bd)
 BazowyModel = declarative_base()
 
@@ -185,6 +253,11 @@ class ModelObiektuBD(BazowyModel):
     
     # Relacje
     orbita_ref = relationship("ModelOrbityBD", back_populates="obiekty_powiazane")
+    
+    # Indeks złożony pod filtr detekcji kolizji (stan, opcjonalnie orbita)
+    __table_args__ = (
+        Index("ix_obj_katalog_stan_orbita", "stan_operacyjny", "id_orbity_powiazanej"),
+    )
 
 
 # Utworzenie tabel
@@ -211,8 +284,7 @@ class SchematOrbitWejscie(BaseModel):
     kat_inklinacji: float = Field(..., ge=0, le=180, alias="inklinacja")
     wezel_wst: float = Field(..., ge=0, lt=360, alias="wezel")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class SchematOrbitWyjscie(BaseModel):
@@ -223,15 +295,12 @@ class SchematOrbitWyjscie(BaseModel):
     inklinacja: float
     wezel: float
     
-    class Config:
-        """Konfiguracja schematu Pydantic"""
-        from_attributes = True
-        populate_by_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
     
     @classmethod
     def z_modelu(cls, model: ModelOrbityBD):
-        """Konwersja z modelu BD"""
-        return cls(
+        """Konwersja z modelu BD (dane z bazy są zaufane - bez walidacji)"""
+        return cls.model_construct(
             id=model.id_rekordu,
             nazwa=model.identyfikator_orbity,
             wysokosc=model.wysokosc_km,
@@ -249,17 +318,14 @@ class SchematObiektuWejscie(BaseModel):
     pozycja_startowa_lon: float = Field(..., ge=-180, le=180, alias="dlugosc_poczatkowa")
     id_orbity_powiazanej: int = Field(alias="id_orbity")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
     
     @validator('data_wprowadzenia', pre=True)
     @classmethod
     def waliduj_date_wprowadzenia(cls, wartosc):
         """Waliduje datę wprowadzenia"""
-        import dateutil.parser as dp
-        
         if isinstance(wartosc, str):
-            dt = dp.isoparse(wartosc)
+            dt = parsuj_czas_iso(wartosc)
         elif isinstance(wartosc, datetime):
             dt = wartosc
         else:
@@ -285,18 +351,16 @@ class SchematObiektuWyjscie(BaseModel):
     dlugosc_poczatkowa: float
     id_orbity: int
     
-    class Config:
-        """Konfiguracja schematu Pydantic"""
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
     
     @classmethod
     def z_modelu(cls, model: ModelObiektuBD):
-        """Konwersja z modelu BD"""
-        return cls(
+        """Konwersja z modelu BD (dane z bazy są zaufane - bez walidacji)"""
+        return cls.model_construct(
             id=model.id_rekordu,
             nazwa=model.nazwa_obiektu,
             operator=model.operator_systemu,
-            data_startu=model.data_wprowadzenia.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            data_startu=formatuj_czas_iso(model.data_wprowadzenia),
             status=model.stan_operacyjny,
             dlugosc_poczatkowa=model.pozycja_startowa_lon,
             id_orbity=model.id_orbity_powiazanej
@@ -14,11 +14,13 @@ Zawiera:
 import logging
 import math
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-import dateutil.parser
-from sqlalchemy.orm import Session
+import numpy as np
+from scipy.spatial import cKDTree
+from sqlalchemy.orm import Session, joinedload
 
 from satelity_modele import (
     WspolrzedneGeodezyjne,
@@ -27,10 +29,12 @@ from satelity_modele import (
     ModelOrbityBD,
     ModelObiektuBD,
     KategoriaPrecyzji,
+    parsuj_czas_iso,
     SREDNICA_BAZOWA_ZIEMI,
     TOLERANCJA_ZBLIZENIA,
     EPSILON_NUMERYCZNY
 )
+from satelity_serwisy_jit import krok_keplera, propaguj_batch
 
 log = logging.getLogger(__name__)
 
@@ -105,23 +109,16 @@ class PropagatorKeplerowski(PropagatorOrbity):
         Returns:
             Współrzędne geodezyjne w danym momencie
         """
-        # Konwersja kątów na radiany
-        inklinacja_rad = math.radians(parametry.inklinacja_kat)
-        raan_rad = math.radians(parametry.wezl_wstepujacy)
-        dlug_pocz_rad = math.radians(dlug_poczatkowa)
-        
-        # Oblicz anomalię prawdziwą
-        omega_kat = parametry.oblicz_predkosc_katowa()
-        anomalia_prawdziwa = (omega_kat * czas_od_epoki + dlug_pocz_rad) % (2 * math.pi)
-        
-        # Oblicz współrzędne w płaszczyźnie orbitalnej
-        szer_orb = math.asin(math.sin(inklinacja_rad) * math.sin(anomalia_prawdziwa))
-        
-        # Oblicz długość geograficzną
-        dlug_wsp = math.atan2(
-            math.cos(inklinacja_rad) * math.sin(anomalia_prawdziwa),
-            math.cos(anomalia_prawdziwa)
-        ) + raan_rad
+        # Anomalia prawdziwa, szerokość i długość - skompilowany rdzeń Numba
+        # (funkcje kątów orbity wyznaczone raz w ParametryOrbitalne)
+        szer_orb, dlug_wsp = krok_keplera(
+            parametry.predkosc_katowa,
+            parametry.sin_inklinacji,
+            parametry.cos_inklinacji,
+            parametry.raan_rad,
+            math.radians(dlug_poczatkowa),
+            czas_od_epoki
+        )
         
         # Konwersja z powrotem na stopnie i normalizacja
         szer_geo = math.degrees(szer_orb)
@@ -139,8 +136,7 @@ class PropagatorKeplerowski(PropagatorOrbity):
     @staticmethod
     def _normalizuj_dlugosc(dlugosc_deg: float) -> float:
         """Normalizuje długość geograficzną do przedziału [-180, 180]"""
-        normalized = ((dlugosc_deg + 180) % 360) - 180
-        return normalized
+        return dlugosc_deg - 360.0 * math.floor((dlugosc_deg + 180.0) / 360.0)
     
     # Implementacja metody abstrakcyjnej
     def oblicz_pozycje(
@@ -182,20 +178,25 @@ class PropagatorKeplerowski(PropagatorOrbity):
 # WALIDATORY
 # ===========================================================================================
 
+@lru_cache(maxsize=1024)
+def _parsuj_iso8601(znacznik_czasowy: str) -> datetime:
+    """Parsuje znacznik ISO 8601 do datetime ze strefą (wynik niemutowalny - buforowany)"""
+    dt = parsuj_czas_iso(znacznik_czasowy)
+    
+    # Zapewnienie timezone-aware datetime
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    
+    return dt
+
+
 class WalidatorISO8601(WalidatorCzasowy):
     """Walidator formatu ISO 8601"""
     
     def waliduj_znacznik(self, znacznik_czasowy: str) -> datetime:
         """Parsuje i waliduje znacznik czasu w formacie ISO 8601"""
         try:
-            dt = dateutil.parser.isoparse(znacznik_czasowy)
-            
-            # Zapewnienie timezone-aware datetime
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            
-            return dt
-            
+            return _parsuj_iso8601(znacznik_czasowy)
         except (ValueError, TypeError) as e:
             raise BladWalidacjiCzasu(
                 f"Nieprawidłowy format czasowy: {znacznik_czasowy}. "
@@ -226,15 +227,37 @@ class SerwisObliczenOrbitalalnych:
         # Walidacja czasu
         moment = self.walidator.waliduj_znacznik(znacznik_czasu)
         
-        # Pobranie obiektu i jego orbity
-        obiekt = sesja_bd.query(ModelObiektuBD).filter_by(id_rekordu=id_obiektu).first()
+        return self.oblicz_pozycje_obiektu_dt(sesja_bd, id_obiektu, moment)
+    
+    def oblicz_pozycje_obiektu_dt(
+        self,
+        sesja_bd: Session,
+        id_obiektu: int,
+        moment: datetime
+    ) -> WspolrzedneGeodezyjne:
+        """Oblicza pozycję obiektu dla sparsowanego już momentu (bez ponownej walidacji)"""
+        
+        # Pobranie obiektu razem z orbitą (jedno zapytanie)
+        obiekt = sesja_bd.get(
+            ModelObiektuBD, id_obiektu, options=[joinedload(ModelObiektuBD.orbita_ref)]
+        )
         if not obiekt:
             raise BladZasobuNieznaleziony(f"Obiekt o ID {id_obiektu} nie istnieje")
         
-        orbita = sesja_bd.query(ModelOrbityBD).filter_by(id_rekordu=obiekt.id_orbity_powiazanej).first()
+        orbita = obiekt.orbita_ref
         if not orbita:
             raise BladZasobuNieznaleziony(f"Orbita obiektu {id_obiektu} nie istnieje")
         
+        return self._oblicz_pozycje_z_modeli(obiekt, orbita, moment)
+    
+    def _oblicz_pozycje_z_modeli(
+        self,
+        obiekt: ModelObiektuBD,
+        orbita: ModelOrbityBD,
+        moment: datetime
+    ) -> WspolrzedneGeodezyjne:
+        """Oblicza pozycję dla wczytanej już pary obiekt-orbita (bez zapytań do bazy)"""
+        
         # Konwersja do parametrów orbitalnych
         params = ParametryOrbitalne(
             polOs_wielka=orbita.wysokosc_km + SREDNICA_BAZOWA_ZIEMI,
@@ -271,60 +294,170 @@ class SerwisAnalizyZdarzen:
     ) -> List[ZdarzeniePrzestrz]:
         """Wykrywa potencjalne kolizje między obiektami"""
         
-        # Pobierz wszystkie aktywne obiekty
-        query = sesja_bd.query(ModelObiektuBD).filter_by(stan_operacyjny="active")
+        # Znacznik czasu parsowany raz dla wszystkich obiektów
+        try:
+            moment = self.serwis_obliczen.walidator.waliduj_znacznik(znacznik_czasu)
+        except BladWalidacjiCzasu as e:
+            log.warning(f"Błąd obliczania pozycji obiektów: {e}")
+            return []
+        
+        # Pobierz aktywne obiekty razem z orbitami (jedno zapytanie)
+        query = sesja_bd.query(ModelObiektuBD).options(
+            joinedload(ModelObiektuBD.orbita_ref, innerjoin=True)
+        ).filter_by(stan_operacyjny="active")
         
         if filtr_orbit:
             query = query.filter_by(id_orbity_powiazanej=filtr_orbit)
         
-        obiekty = query.all()
+        obiekty = query.order_by(ModelObiektuBD.id_rekordu).all()
         
         if len(obiekty) < 2:
             return []
         
-        # Oblicz pozycje wszystkich obiektów
-        pozycje = {}
+        # Model Keplerowski liczony wsadowo; inne propagatory - pozycja każdego obiektu przez strategię
+        if isinstance(self.serwis_obliczen.propagator, PropagatorKeplerowski):
+            ids, szer, dlug, wys = self._pozycje_keplerowskie(obiekty, moment)
+        else:
+            ids, szer, dlug, wys = self._pozycje_propagatorem(obiekty, moment)
+        
+        if len(ids) < 2:
+            return []
+        
+        # Kandydaci z drzewa k-d (promień z zapasem na zaokrąglenia), potem dokładny próg
+        xyz = wspolrzedne_ecef(szer, dlug, wys)
+        pary = cKDTree(xyz).query_pairs(
+            r=self.prog_zblizenia + EPSILON_NUMERYCZNY, output_type="ndarray"
+        )
+        pary = pary[np.lexsort((pary[:, 1], pary[:, 0]))]
+        para_i, para_j = pary[:, 0], pary[:, 1]
+        dystanse = np.sqrt(((xyz[para_j] - xyz[para_i]) ** 2).sum(axis=1))
+        trafienia = np.flatnonzero(dystanse <= self.prog_zblizenia)
+        
+        # Środki par liczone wektorowo; długość jako średnia kołowa (zawinięcie przez ±180°)
+        ti, tj = para_i[trafienia], para_j[trafienia]
+        sr_lat = 0.5 * (szer[ti] + szer[tj])
+        dlug_i, dlug_j = np.radians(dlug[ti]), np.radians(dlug[tj])
+        sr_lon = np.degrees(np.arctan2(
+            np.sin(dlug_i) + np.sin(dlug_j), np.cos(dlug_i) + np.cos(dlug_j)
+        ))
+        sr_alt = 0.5 * (wys[ti] + wys[tj])
+        
+        # Wykryj zbliżenia
+        zdarzenia = [
+            ZdarzeniePrzestrz(
+                obiekt_id_a=id_a,
+                obiekt_id_b=id_b,
+                moment_czasu=moment,
+                lokalizacja=WspolrzedneGeodezyjne(lat, lon, alt),
+                dystans_min=dystans
+            )
+            for id_a, id_b, lat, lon, alt, dystans in zip(
+                ids[ti].tolist(), ids[tj].tolist(), sr_lat.tolist(), sr_lon.tolist(),
+                sr_alt.tolist(), dystanse[trafienia].tolist()
+            )
+        ]
+        
+        return zdarzenia
+    
+    def _pozycje_keplerowskie(
+        self,
+        obiekty: List[ModelObiektuBD],
+        moment: datetime
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pozycje obiektów z modelu Keplerowskiego liczone wsadowo (kernel Numba)
+        
+        Returns:
+            Krotka tablic (id, szerokość, długość [stopnie], wysokość [km]) - tylko obiekty
+            wprowadzone przed momentem i mające sąsiada w paśmie wysokości
+        """
+        # Parametry orbitalne raz na orbitę - obiekty na wspólnej orbicie dzielą instancję
+        parametry_orbit: Dict[int, ParametryOrbitalne] = {}
         for obj in obiekty:
-            try:
-                poz = self.serwis_obliczen.oblicz_pozycje_obiektu(
-                    sesja_bd=sesja_bd,
-                    id_obiektu=obj.id_rekordu,
-                    znacznik_czasu=znacznik_czasu
+            orb = obj.orbita_ref
+            if orb.id_rekordu not in parametry_orbit:
+                parametry_orbit[orb.id_rekordu] = ParametryOrbitalne(
+                    polOs_wielka=orb.wysokosc_km + SREDNICA_BAZOWA_ZIEMI,
+                    inklinacja_kat=orb.kat_inklinacji,
+                    wezl_wstepujacy=orb.wezel_wst
                 )
-                pozycje[obj.id_rekordu] = poz
+        parametry = [parametry_orbit[obj.id_orbity_powiazanej] for obj in obiekty]
+        
+        # Parametry obiektów jako kolumny NumPy
+        n = len(obiekty)
+        ids = np.fromiter((obj.id_rekordu for obj in obiekty), dtype=np.int64, count=n)
+        polos = np.fromiter((p.polOs_wielka for p in parametry), dtype=np.float64, count=n)
+        omega = np.fromiter((p.predkosc_katowa for p in parametry), dtype=np.float64, count=n)
+        sin_inkl = np.fromiter((p.sin_inklinacji for p in parametry), dtype=np.float64, count=n)
+        cos_inkl = np.fromiter((p.cos_inklinacji for p in parametry), dtype=np.float64, count=n)
+        raan_rad = np.fromiter((p.raan_rad for p in parametry), dtype=np.float64, count=n)
+        lon0_rad = np.radians(np.fromiter((obj.pozycja_startowa_lon for obj in obiekty), dtype=np.float64, count=n))
+        
+        # Czas od wprowadzenia liczony na datetime (dokładność mikrosekund jak w propagatorze)
+        daty = [obj.data_wprowadzenia for obj in obiekty]
+        delta_t = np.array([
+            (moment - (d if d.tzinfo else d.replace(tzinfo=timezone.utc))).total_seconds() for d in daty
+        ])
+        
+        # Pomiń obiekty jeszcze niewprowadzone
+        poprawne = (delta_t >= 0) & (np.abs(omega) >= EPSILON_NUMERYCZNY)
+        for id_pominiety in ids[~poprawne].tolist():
+            log.warning(f"Błąd obliczania pozycji dla obiektu {id_pominiety}: obiekt nie był jeszcze wprowadzony")
+        
+        if np.count_nonzero(poprawne) < 2:
+            return ids[:0], polos[:0], polos[:0], polos[:0]
+        
+        ids, polos, sin_inkl, cos_inkl, raan_rad, lon0_rad, delta_t, omega = (
+            kol[poprawne] for kol in (ids, polos, sin_inkl, cos_inkl, raan_rad, lon0_rad, delta_t, omega)
+        )
+        
+        # Dystans pary nie jest mniejszy niż różnica promieni orbit - przed propagacją odrzuć
+        # obiekty bez sąsiada w paśmie wysokości o szerokości progu (sortowanie + różnice)
+        kolejnosc = np.argsort(polos, kind="stable")
+        sasiad = np.diff(polos[kolejnosc]) <= self.prog_zblizenia + EPSILON_NUMERYCZNY
+        w_pasmie = np.zeros(len(ids), dtype=bool)
+        w_pasmie[kolejnosc[1:]] |= sasiad
+        w_pasmie[kolejnosc[:-1]] |= sasiad
+        
+        if np.count_nonzero(w_pasmie) < 2:
+            return ids[:0], polos[:0], polos[:0], polos[:0]
+        
+        ids, polos, sin_inkl, cos_inkl, raan_rad, lon0_rad, delta_t, omega = (
+            kol[w_pasmie] for kol in (ids, polos, sin_inkl, cos_inkl, raan_rad, lon0_rad, delta_t, omega)
+        )
+        
+        # Propagacja Keplerowska wszystkich obiektów naraz (gufunc Numba)
+        szer, dlug = propaguj_batch(
+            omega, sin_inkl, cos_inkl, raan_rad, lon0_rad, delta_t
+        )
+        
+        return ids, szer, dlug, polos - SREDNICA_BAZOWA_ZIEMI
+    
+    def _pozycje_propagatorem(
+        self,
+        obiekty: List[ModelObiektuBD],
+        moment: datetime
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pozycje obiektów przez wstrzyknięty propagator (dowolna strategia), obiekt po obiekcie
+        
+        Returns:
+            Krotka tablic (id, szerokość, długość [stopnie], wysokość [km]) - obiekty,
+            dla których propagacja się powiodła
+        """
+        ids, pozycje = [], []
+        for obj in obiekty:
+            try:
+                poz = self.serwis_obliczen._oblicz_pozycje_z_modeli(obj, obj.orbita_ref, moment)
             except Exception as e:
                 log.warning(f"Błąd obliczania pozycji dla obiektu {obj.id_rekordu}: {e}")
                 continue
+            ids.append(obj.id_rekordu)
+            pozycje.append((poz.szer_geogr, poz.dlug_geogr, poz.wysokosc_npm))
         
-        # Wykryj zbliżenia
-        zdarzenia = []
-        ids = list(pozycje.keys())
-        
-        for i, id_a in enumerate(ids):
-            for j in range(i + 1, len(ids)):
-                id_b = ids[j]
-                poz_a, poz_b = pozycje[id_a], pozycje[id_b]
-                
-                dystans = poz_a.dystans_do(poz_b)
-                
-                if dystans <= self.prog_zblizenia:
-                    # Użyj środka między pozycjami jako lokalizacji zdarzenia
-                    sr_lat = (poz_a.szer_geogr + poz_b.szer_geogr) / 2
-                    sr_lon = (poz_a.dlug_geogr + poz_b.dlug_geogr) / 2
-                    sr_alt = (poz_a.wysokosc_npm + poz_b.wysokosc_npm) / 2
-                    
-                    moment = self.serwis_obliczen.walidator.waliduj_znacznik(znacznik_czasu)
-                    
-                    zdarzenie = ZdarzeniePrzestrz(
-                        obiekt_id_a=id_a,
-                        obiekt_id_b=id_b,
-                        moment_czasu=moment,
-                        lokalizacja=WspolrzedneGeodezyjne(sr_lat, sr_lon, sr_alt),
-                        dystans_min=dystans
-                    )
-                    zdarzenia.append(zdarzenie)
+        kolumny = np.array(pozycje, dtype=np.float64).reshape(-1, 3)
         
-        return zdarzenia
+        return np.array(ids, dtype=np.int64), kolumny[:, 0], kolumny[:, 1], kolumny[:, 2]
 
 
 # ===========================================================================================
@@ -357,6 +490,24 @@ def oblicz_roznice_czasu(
     return konwersje[kategoria](sekundy)
 
 
+def wspolrzedne_ecef(
+    szer_deg: np.ndarray,
+    dlug_deg: np.ndarray,
+    wysokosc_km: np.ndarray
+) -> np.ndarray:
+    """Wektorowa konwersja współrzędnych geodezyjnych do ECEF, wynik (N, 3) [km]"""
+    promien = SREDNICA_BAZOWA_ZIEMI + wysokosc_km
+    lat_rad = np.radians(szer_deg)
+    lon_rad = np.radians(dlug_deg)
+    cos_lat = np.cos(lat_rad)
+    
+    return np.column_stack((
+        promien * cos_lat * np.cos(lon_rad),
+        promien * cos_lat * np.sin(lon_rad),
+        promien * np.sin(lat_rad)
+    ))
+
+
 def waliduj_parametry_orbitalne(wysokosc: float, inklinacja: float, raan: float) -> bool:
     """Waliduje parametry orbitalne"""
     from satelity_modele import MINIMALNA_WYSOKOSC_ORBITY, MAKSYMALNA_WYSOKOSC_ORBITY
@@ -0,0 +1,353 @@
+"""
+Numba - Kernele obliczeniowe propagacji orbit
+
+System Śledzenia Orbit Satelitarnych - Warstwa Obliczeń Wsadowych
+Autor: Aleks Czarnecki
+
+Zawiera:
+- Stałe orbitalne liczone raz na obiekt
+- Wsadową propagację Keplerowską (gufunc) dla tablic parametrów orbitalnych
+- Połączony kernel propagacji i detekcji zbliżeń po całej osi czasu
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+from numba import float64, get_num_threads, guvectorize, njit, prange
+
+from satelity_modele import (
+    PARAMETR_GRAWIT_ZIEMI,
+    SREDNICA_BAZOWA_ZIEMI,
+    EPSILON_NUMERYCZNY
+)
+
+# Maksymalna liczba kroków czasowych przetwarzanych sekwencyjnie przez jeden wątek
+ROZMIAR_BLOKU_CZASU = 256
+# Powyżej tej liczby obiektów pary wyszukiwane są przez siatkę przestrzenną
+MIN_OBIEKTOW_SIATKI = 32
+# Stałe redukcji kątów (mnożenie przez odwrotność zamiast dzielenia)
+DWA_PI = 2 * math.pi
+ODWROTNOSC_DWA_PI = 1.0 / DWA_PI
+
+
+# ===========================================================================================
+# PRZYGOTOWANIE PARAMETRÓW
+# ===========================================================================================
+
+def stale_orbitalne(
+    polOs: np.ndarray,
+    incl: np.ndarray,
+    raan: np.ndarray,
+    lon0: np.ndarray
+) -> Tuple[np.ndarray, ...]:
+    """
+    Wylicza niezależne od czasu stałe orbitalne - raz na obiekt
+    
+    Returns:
+        Krotka tablic (omega [rad/s], sin(i), cos(i), raan [rad], lon0 [rad], wysokość [km])
+    """
+    okres = 2 * np.pi * np.sqrt(polOs**3 / PARAMETR_GRAWIT_ZIEMI)
+    omega = np.where(okres > EPSILON_NUMERYCZNY, 2 * np.pi / okres, 0.0)
+    incl_rad = np.radians(incl)
+    
+    return (
+        omega,
+        np.sin(incl_rad),
+        np.cos(incl_rad),
+        np.radians(raan),
+        np.radians(lon0),
+        polOs - SREDNICA_BAZOWA_ZIEMI
+    )
+
+
+# ===========================================================================================
+# PROPAGACJA WSADOWA
+# ===========================================================================================
+
+@njit(cache=True, fastmath=True)
+def krok_keplera(omega, sin_incl, cos_incl, raan_rad, lon0_rad, dt):
+    """Rdzeń propagacji Keplerowskiej - zwraca (szerokość, długość) w radianach"""
+    # Orbity kołowe (e = 0): anomalia mimośrodowa = średnia = prawdziwa, więc równanie
+    # Keplera nie jest rozwiązywane - brak iteracji i rozgałęzień, tablicowanie E zbędne
+    kat = omega * dt + lon0_rad
+    anomalia_prawdziwa = kat - DWA_PI * math.floor(kat * ODWROTNOSC_DWA_PI)
+    
+    # Orbita równikowa prosta (i = 0): szerokość zerowa, długość wprost z anomalii - bez
+    # asin/atan2; sin(180°) w float64 nie jest zerem, więc orbity wsteczne idą ścieżką ogólną
+    if sin_incl == 0.0:
+        return 0.0, anomalia_prawdziwa + raan_rad
+    
+    sin_anom = math.sin(anomalia_prawdziwa)
+    
+    szer_orb = math.asin(sin_incl * sin_anom)
+    dlug_wsp = math.atan2(cos_incl * sin_anom, math.cos(anomalia_prawdziwa)) + raan_rad
+    
+    return szer_orb, dlug_wsp
+
+
+@njit(cache=True, fastmath=True)
+def normalizuj_dlugosc_deg(dlugosc_deg):
+    """Normalizuje długość geograficzną do przedziału [-180, 180) - floor zamiast modulo"""
+    return dlugosc_deg - 360.0 * math.floor((dlugosc_deg + 180.0) / 360.0)
+
+
+@guvectorize(
+    [(float64, float64, float64, float64, float64, float64, float64[:], float64[:])],
+    "(),(),(),(),(),()->(),()",
+    nopython=True,
+    cache=True,
+    fastmath=True,
+    target="parallel"
+)
+def propaguj_batch(omega, sin_incl, cos_incl, raan_rad, lon0_rad, dt, szer, dlug):
+    """
+    Propagacja Keplerowska dla tablic stałych orbitalnych (układ SoA)
+    
+    Args:
+        omega: Prędkości kątowe [rad/s]
+        sin_incl, cos_incl: Sinus i cosinus inklinacji
+        raan_rad: Węzły wstępujące [rad]
+        lon0_rad: Długości początkowe [rad]
+        dt: Czas od wprowadzenia [sekundy]
+    
+    Returns:
+        Krotka tablic (szerokość [stopnie], długość [stopnie])
+    """
+    szer_orb, dlug_wsp = krok_keplera(omega, sin_incl, cos_incl, raan_rad, lon0_rad, dt)
+    
+    szer[0] = math.degrees(szer_orb)
+    dlug[0] = normalizuj_dlugosc_deg(math.degrees(dlug_wsp))
+
+
+# ===========================================================================================
+# DETEKCJA ZBLIŻEŃ - kernel połączony (propagacja + odległości)
+# ===========================================================================================
+
+@njit(cache=True, fastmath=True)
+def _pozycje_ecef(omega, sin_incl, cos_incl, raan_rad, lon0_rad, promien, t_wprow, t, xyz, aktywny):
+    """Wypełnia bufor ECEF wszystkich obiektów w chwili t (obiekty przed startem pomija)"""
+    for i in range(omega.shape[0]):
+        dt = t - t_wprow[i]
+        aktywny[i] = dt >= 0
+        if not aktywny[i]:
+            continue
+        
+        szer_orb, dlug_wsp = krok_keplera(
+            omega[i], sin_incl[i], cos_incl[i], raan_rad[i], lon0_rad[i], dt
+        )
+        cos_szer = math.cos(szer_orb)
+        xyz[i, 0] = promien[i] * cos_szer * math.cos(dlug_wsp)
+        xyz[i, 1] = promien[i] * cos_szer * math.sin(dlug_wsp)
+        xyz[i, 2] = promien[i] * math.sin(szer_orb)
+
+
+@njit(cache=True, fastmath=True)
+def _odleglosc2(xyz, i, j, prog2):
+    """Kwadrat odległości pary - przerywa po osi, na której suma przekroczyła próg"""
+    dx = xyz[i, 0] - xyz[j, 0]
+    d2 = dx * dx
+    if d2 >= prog2:
+        return d2
+    dy = xyz[i, 1] - xyz[j, 1]
+    d2 += dy * dy
+    if d2 >= prog2:
+        return d2
+    dz = xyz[i, 2] - xyz[j, 2]
+    return d2 + dz * dz
+
+
+@njit(cache=True)
+def _klucz_komorki(cx, cy, cz):
+    """Klucz haszujący komórki siatki przestrzennej"""
+    return (cx * 73856093) ^ (cy * 19349663) ^ (cz * 83492791)
+
+
+@njit(cache=True, fastmath=True)
+def _przeglad_par_siatka(xyz, aktywny, prog, zapisz, poz, wynik_a, wynik_b, wynik_d2):
+    """Przegląd par przez haszowanie komórek o boku prog - testuje tylko 27 komórek sąsiednich"""
+    prog2 = prog * prog
+    aktywne = np.flatnonzero(aktywny)
+    komorki = np.empty((xyz.shape[0], 3), dtype=np.int64)
+    klucze = np.empty(aktywne.shape[0], dtype=np.int64)
+    
+    for m in range(aktywne.shape[0]):
+        i = aktywne[m]
+        for o in range(3):
+            komorki[i, o] = math.floor(xyz[i, o] / prog)
+        klucze[m] = _klucz_komorki(komorki[i, 0], komorki[i, 1], komorki[i, 2])
+    
+    kolejnosc = np.argsort(klucze)
+    posortowane = klucze[kolejnosc]
+    licznik = 0
+    
+    for i in aktywne:
+        for ox in range(-1, 2):
+            for oy in range(-1, 2):
+                for oz in range(-1, 2):
+                    cx, cy, cz = komorki[i, 0] + ox, komorki[i, 1] + oy, komorki[i, 2] + oz
+                    klucz = _klucz_komorki(cx, cy, cz)
+                    
+                    m = np.searchsorted(posortowane, klucz)
+                    while m < posortowane.shape[0] and posortowane[m] == klucz:
+                        j = aktywne[kolejnosc[m]]
+                        m += 1
+                        # Kolizje haszy odrzuca porównanie współrzędnych komórki
+                        if j <= i or komorki[j, 0] != cx or komorki[j, 1] != cy or komorki[j, 2] != cz:
+                            continue
+                        
+                        d2 = _odleglosc2(xyz, i, j, prog2)
+                        if d2 >= prog2:
+                            continue
+                        
+                        if zapisz:
+                            wynik_a[poz + licznik] = i
+                            wynik_b[poz + licznik] = j
+                            wynik_d2[poz + licznik] = d2
+                        licznik += 1
+    
+    return licznik
+
+
+@njit(cache=True, fastmath=True)
+def _przeglad_par(xyz, aktywny, prog, zapisz, poz, wynik_a, wynik_b, wynik_d2):
+    """Porównuje pary i < j; zwraca liczbę par bliższych niż prog (opcjonalnie je zapisuje)"""
+    n = xyz.shape[0]
+    if n > MIN_OBIEKTOW_SIATKI:
+        return _przeglad_par_siatka(xyz, aktywny, prog, zapisz, poz, wynik_a, wynik_b, wynik_d2)
+    
+    prog2 = prog * prog
+    licznik = 0
+    
+    for i in range(n):
+        if not aktywny[i]:
+            continue
+        for j in range(i + 1, n):
+            if not aktywny[j]:
+                continue
+            
+            d2 = _odleglosc2(xyz, i, j, prog2)
+            if d2 >= prog2:
+                continue
+            
+            if zapisz:
+                wynik_a[poz + licznik] = i
+                wynik_b[poz + licznik] = j
+                wynik_d2[poz + licznik] = d2
+            licznik += 1
+    
+    return licznik
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _zlicz_zblizenia(
+    omega, sin_incl, cos_incl, raan_rad, lon0_rad, promien, t_wprow, czasy, prog, rozmiar_bloku
+):
+    """Pierwszy przebieg: liczba zbliżeń w każdym kroku czasowym (prange po blokach czasu)"""
+    n = omega.shape[0]
+    n_t = czasy.shape[0]
+    liczniki = np.zeros(n_t, dtype=np.int64)
+    pusty_i = np.empty(0, dtype=np.int64)
+    pusty_f = np.empty(0, dtype=np.float64)
+    
+    n_blokow = (n_t + rozmiar_bloku - 1) // rozmiar_bloku
+    for b in prange(n_blokow):
+        xyz = np.empty((n, 3), dtype=np.float64)
+        aktywny = np.empty(n, dtype=np.bool_)
+        
+        for k in range(b * rozmiar_bloku, min((b + 1) * rozmiar_bloku, n_t)):
+            _pozycje_ecef(
+                omega, sin_incl, cos_incl, raan_rad, lon0_rad, promien, t_wprow, czasy[k], xyz, aktywny
+            )
+            liczniki[k] = _przeglad_par(xyz, aktywny, prog, False, 0, pusty_i, pusty_i, pusty_f)
+    
+    return liczniki
+
+
+@njit(cache=True, fastmath=True)
+def _zbierz_zblizenia(
+    omega, sin_incl, cos_incl, raan_rad, lon0_rad, promien, t_wprow, czasy, prog, kroki, przesuniecia
+):
+    """Drugi przebieg: zapis par tylko dla kroków, w których wykryto zbliżenia"""
+    n = omega.shape[0]
+    razem = przesuniecia[-1]
+    idx_a = np.empty(razem, dtype=np.int64)
+    idx_b = np.empty(razem, dtype=np.int64)
+    idx_t = np.empty(razem, dtype=np.int64)
+    d2 = np.empty(razem, dtype=np.float64)
+    xyz = np.empty((n, 3), dtype=np.float64)
+    aktywny = np.empty(n, dtype=np.bool_)
+    
+    for m in range(kroki.shape[0]):
+        k = kroki[m]
+        _pozycje_ecef(
+            omega, sin_incl, cos_incl, raan_rad, lon0_rad, promien, t_wprow, czasy[k], xyz, aktywny
+        )
+        poz = przesuniecia[m]
+        licznik = _przeglad_par(xyz, aktywny, prog, True, poz, idx_a, idx_b, d2)
+        idx_t[poz:poz + licznik] = k
+        
+        # Kolejność (i, j) w obrębie kroku - siatka przestrzenna zwraca pary w porządku komórek
+        kolejnosc = poz + np.argsort(idx_a[poz:poz + licznik] * n + idx_b[poz:poz + licznik])
+        idx_a[poz:poz + licznik] = idx_a[kolejnosc]
+        idx_b[poz:poz + licznik] = idx_b[kolejnosc]
+        d2[poz:poz + licznik] = d2[kolejnosc]
+    
+    # Lokalizacja zdarzenia - pozycja pierwszego obiektu pary
+    szer = np.empty(razem, dtype=np.float64)
+    dlug = np.empty(razem, dtype=np.float64)
+    for e in range(razem):
+        i = idx_a[e]
+        szer_orb, dlug_wsp = krok_keplera(
+            omega[i], sin_incl[i], cos_incl[i], raan_rad[i], lon0_rad[i], czasy[idx_t[e]] - t_wprow[i]
+        )
+        szer[e] = math.degrees(szer_orb)
+        dlug[e] = normalizuj_dlugosc_deg(math.degrees(dlug_wsp))
+    
+    return idx_a, idx_b, idx_t, np.sqrt(d2), szer, dlug
+
+
+def skanuj_zblizenia(
+    omega: np.ndarray,
+    sin_incl: np.ndarray,
+    cos_incl: np.ndarray,
+    raan_rad: np.ndarray,
+    lon0_rad: np.ndarray,
+    wys: np.ndarray,
+    t_wprow: np.ndarray,
+    czasy: np.ndarray,
+    prog: float
+) -> Tuple[np.ndarray, ...]:
+    """
+    Wykrywa zbliżenia wszystkich par obiektów na całej siatce czasowej
+    
+    Propagacja w kernelu to wyłącznie model Keplerowski orbit kołowych (krok_keplera) -
+    wywołujący odpowiada za użycie go tylko z PropagatorKeplerowski.
+    
+    Args:
+        omega, sin_incl, cos_incl, raan_rad, lon0_rad, wys: Stałe orbitalne (patrz stale_orbitalne)
+        t_wprow: Momenty wprowadzenia obiektów [sekundy epoki]
+        czasy: Siatka czasowa [sekundy epoki]
+        prog: Próg wykrywania [km]
+    
+    Returns:
+        Krotka tablic (idx_a, idx_b, idx_t, dystans [km], szerokość, długość [stopnie])
+        uporządkowana według (idx_t, idx_a, idx_b); idx_a < idx_b indeksują tablice
+        parametrów, idx_t indeksuje siatkę czasową
+    """
+    promien = SREDNICA_BAZOWA_ZIEMI + wys
+    
+    # Krótsze bloki dla krótkich siatek, aby każdy wątek dostał pracę (liczba wątków
+    # odczytywana poza kernelem - inaczej Numba nie zapisuje go w pamięci podręcznej)
+    rozmiar_bloku = max(1, min(ROZMIAR_BLOKU_CZASU, len(czasy) // (4 * get_num_threads())))
+    
+    liczniki = _zlicz_zblizenia(
+        omega, sin_incl, cos_incl, raan_rad, lon0_rad, promien, t_wprow, czasy, prog, rozmiar_bloku
+    )
+    kroki = np.flatnonzero(liczniki)
+    przesuniecia = np.zeros(len(kroki) + 1, dtype=np.int64)
+    np.cumsum(liczniki[kroki], out=przesuniecia[1:])
+    
+    return _zbierz_zblizenia(
+        omega, sin_incl, cos_incl, raan_rad, lon0_rad, promien, t_wprow, czasy, prog, kroki, przesuniecia
+    )
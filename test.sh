@@ -167,6 +167,108 @@ test_endpoint "Stronicowanie (skip=1, limit=1)" \
     "curl -s '$BASE_URL/satelity/?skip=1&limit=1'" \
     'pomin'
 
+echo ""
+echo "CZĘŚĆ 9: Zbliżenia - Siatka Przestrzenna"
+echo "-----------------------------------"
+
+# Pole "id" z odpowiedzi JSON
+wyciagnij_id() {
+    grep -o '"id":[0-9]*' | head -1 | cut -d: -f2
+}
+
+utworz_satelite_siatki() {
+    curl -s -X POST $BASE_URL/satelity/ -H 'Content-Type: application/json' \
+        -d "{\"nazwa\":\"$1\",\"operator\":\"TestOrg\",\"data_startu\":\"2024-06-15T12:00:00Z\",\"status\":\"active\",\"dlugosc_poczatkowa\":$2,\"id_orbity\":$ORBITA_SIATKI}" \
+        | wyciagnij_id
+}
+
+# Pary zbliżeń jako "id1-id2," w kolejności odpowiedzi
+pary_zblizen() {
+    curl -s "$BASE_URL/zblizenia?$1" \
+        | grep -o '"satelita1":[0-9]*,"satelita2":[0-9]*' \
+        | sed 's/"satelita1"://; s/,"satelita2":/-/' | tr '\n' ','
+}
+
+# Orbita równikowa: w chwili startu (dt = 0) pozycja wynika wprost z długości początkowej.
+# Ponad 32 aktywne obiekty - pary wyszukiwane przez siatkę przestrzenną (komórki 10 m)
+ORBITA_SIATKI=$(curl -s -X POST $BASE_URL/orbity/ -H 'Content-Type: application/json' \
+    -d '{"nazwa":"TEST-SIATKA","wysokosc":550,"inklinacja":0,"wezel":0}' | wyciagnij_id)
+
+for k in $(seq 0 33); do
+    utworz_satelite_siatki "SIATKA-$k" $((k * 8 - 150)) > /dev/null
+done
+
+# Para A: ~6 m; para B: ~5 m po obu stronach granicy komórek y = 0; para C: ~12 m (poza progiem)
+PARA_A1=$(utworz_satelite_siatki "SIATKA-A1" 100)
+PARA_A2=$(utworz_satelite_siatki "SIATKA-A2" 100.00005)
+PARA_B1=$(utworz_satelite_siatki "SIATKA-B1" -0.00002)
+PARA_B2=$(utworz_satelite_siatki "SIATKA-B2" 0.00002)
+utworz_satelite_siatki "SIATKA-C1" -160 > /dev/null
+utworz_satelite_siatki "SIATKA-C2" -159.9999 > /dev/null
+
+# Precyzja 1h zaokrągla oba krańce do 12:00 - dokładnie jeden krok siatki czasowej
+test_endpoint "Zbliżenia przez siatkę (dokładne pary)" \
+    "pary_zblizen 'data_poczatkowa=2024-06-15T12:00:00Z&data_koncowa=2024-06-15T12:01:00Z&precyzja=1h'" \
+    "^$PARA_A1-$PARA_A2,$PARA_B1-$PARA_B2,\$"
+
+echo ""
+echo "CZĘŚĆ 10: Zbliżenia - Pamięć Bloków"
+echo "-----------------------------------"
+
+# Zdarzenia (pełne obiekty JSON, po jednym w wierszu) dla okna [$1, $2] z precyzją 1s
+zdarzenia_okna() {
+    curl -s "$BASE_URL/zblizenia?data_poczatkowa=$1&data_koncowa=$2&precyzja=1s" \
+        | grep -o '{"satelita1":[^{]*{[^}]*}}'
+}
+
+# To samo okno liczone na zimno: fragmenty po 240 kroków nie obejmują pełnego bloku
+# pamięci (256 kroków), więc nie są ani zapisywane, ani czytane z pamięci
+zdarzenia_okna_na_zimno() {
+    local od=$(date -u -d "$1" +%s)
+    local do=$(date -u -d "$2" +%s)
+    while [ $od -le $do ]; do
+        local koniec=$((od + 239 < do ? od + 239 : do))
+        zdarzenia_okna "$(date -u -d @$od +%Y-%m-%dT%H:%M:%SZ)" "$(date -u -d @$koniec +%Y-%m-%dT%H:%M:%SZ)"
+        od=$((koniec + 1))
+    done
+}
+
+porownaj_z_zimnym() {
+    local cieply=$(zdarzenia_okna "$1" "$2")
+    local zimny=$(zdarzenia_okna_na_zimno "$1" "$2")
+    if [ -n "$cieply" ] && [ "$cieply" = "$zimny" ]; then
+        echo "zgodne $(echo "$cieply" | wc -l)"
+    else
+        echo "rozne: $(echo "$cieply" | wc -l) vs $(echo "$zimny" | wc -l) zdarzen"
+    fi
+}
+
+# 12:00:00 wypada w połowie bloku (epoka / 256 = ...,25); pierwsze wywołanie wypełnia pamięć
+zdarzenia_okna 2024-06-15T12:00:00Z 2024-06-15T12:10:00Z > /dev/null
+
+test_endpoint "Okno od połowy bloku (z pamięci)" \
+    "porownaj_z_zimnym 2024-06-15T12:00:00Z 2024-06-15T12:10:00Z" \
+    "^zgodne [1-9]"
+
+test_endpoint "Okno nakładające się na poprzednie" \
+    "porownaj_z_zimnym 2024-06-15T12:05:00Z 2024-06-15T12:15:00Z" \
+    "^zgodne [1-9]"
+
+# Nowy obiekt między satelitami pary A - dwie nowe pary, pamięć musi zostać pominięta
+utworz_satelite_siatki "SIATKA-A3" 100.000025 > /dev/null
+
+test_endpoint "Pamięć po dodaniu obiektu" \
+    "porownaj_z_zimnym 2024-06-15T12:00:00Z 2024-06-15T12:10:00Z" \
+    "^zgodne [1-9]"
+
+# Odsunięcie satelity pary B - para znika
+curl -s -X PUT $BASE_URL/satelity/$PARA_B2 -H 'Content-Type: application/json' \
+    -d '{"nazwa":"SIATKA-B2","operator":"TestOrg","data_startu":"2024-06-15T12:00:00Z","status":"active","dlugosc_poczatkowa":0.01,"id_orbity":'$ORBITA_SIATKI'}' > /dev/null
+
+test_endpoint "Pamięć po zmianie obiektu" \
+    "porownaj_z_zimnym 2024-06-15T12:00:00Z 2024-06-15T12:10:00Z" \
+    "^zgodne [1-9]"
+
 echo ""
 echo "========================================="
 echo "WYNIKI KOŃCOWE"